@@ -165,7 +165,27 @@ class OSCMessage {
     
     return new OSCMessage(address, args);
   }
-  
+
+  static parseAll(buffer) {
+    // A datagram is either a single message or a "#bundle": 8-byte
+    // marker, 8-byte timetag, then size-prefixed elements which may
+    // themselves be bundles. The plinths only send IMMEDIATELY-tagged
+    // bundles, so the timetag is skipped and every element dispatched
+    // at once.
+    if (buffer.length >= 16 && buffer.toString('ascii', 0, 7) === '#bundle') {
+      const messages = [];
+      let offset = 16;  // skip marker + timetag
+      while (offset + 4 <= buffer.length) {
+        const size = buffer.readInt32BE(offset);
+        offset += 4;
+        messages.push(...OSCMessage.parseAll(buffer.subarray(offset, offset + size)));
+        offset += size;
+      }
+      return messages;
+    }
+    return [OSCMessage.parse(buffer)];
+  }
+
   toBuffer() {
     // Build OSC message
     const buffers = [];
@@ -395,8 +415,9 @@ class ManagementNodeServer {
     
     server.on('message', (msg, rinfo) => {
       try {
-        const osc = OSCMessage.parse(msg);
-        this.handlePlinthMessage(plinthId, osc, rinfo);
+        for (const osc of OSCMessage.parseAll(msg)) {
+          this.handlePlinthMessage(plinthId, osc, rinfo);
+        }
       } catch (e) {
         Logger.error(`Failed to parse OSC from plinth ${plinthId}: ${e.message}`);
       }
@@ -418,8 +439,9 @@ class ManagementNodeServer {
     
     this.mgmtServer.on('message', (msg, rinfo) => {
       try {
-        const osc = OSCMessage.parse(msg);
-        this.handleQSYSMessage(osc, rinfo);
+        for (const osc of OSCMessage.parseAll(msg)) {
+          this.handleQSYSMessage(osc, rinfo);
+        }
       } catch (e) {
         Logger.error(`Failed to parse OSC from Q-SYS: ${e.message}`);
       }
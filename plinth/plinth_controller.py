@@ -40,10 +40,13 @@ import sys
 import time
 import threading
 import logging
+import logging.handlers
 import json
 import os
+import queue
+import select
+import socket
 from datetime import datetime
-from collections import deque
 from enum import Enum
 
 try:
@@ -53,8 +56,16 @@ except (ImportError, RuntimeError):
     GPIO = None
     print("[WARN] RPi.GPIO not available; running in simulation mode")
 
+try:
+    import pigpio
+except ImportError:
+    # Optional: hardware-timed STEP waveforms. Software stepping is used
+    # when pigpio (or its daemon) is unavailable.
+    pigpio = None
+
 try:
     from pythonosc import udp_client, osc_server
+    from pythonosc import osc_bundle_builder, osc_message_builder
     from pythonosc.dispatcher import Dispatcher
 except ImportError:
     print("[ERROR] python-osc not installed. Install with: pip install python-osc")
@@ -97,6 +108,14 @@ class PlinthConfig:
     # Reconnection
     RECONNECT_ATTEMPTS = 10
     RECONNECT_DELAY = 5.0  # seconds
+
+    # OSC send coalescing: events queued within this window go out as
+    # one bundle (one datagram) instead of separate packets
+    OSC_COALESCE_WINDOW = 0.005  # 5 ms
+
+    # OSC server UDP receive buffer; the kernel default (~208 KB) drops
+    # packets under bursty command traffic (e.g. LED brightness ramps)
+    OSC_RCVBUF_SIZE = 4 * 1024 * 1024  # 4 MB
     
     # Logging
     LOG_FILE = f"/var/log/plinth_{PLINTH_ID}.log"
@@ -107,28 +126,33 @@ class PlinthConfig:
 # ============================================================================
 
 def setup_logging():
-    """Configure logging to file and console."""
+    """Configure logging to file and console.
+
+    Records are routed through a queue: emitters (including OSC handler
+    and GPIO callback threads) only enqueue, and a background listener
+    thread performs the actual file/console writes. This keeps a
+    write()+flush() syscall out of every hot-path log call.
+    """
     logger = logging.getLogger(__name__)
     logger.setLevel(PlinthConfig.LOG_LEVEL)
-    
+
     # Ensure log directory exists
     log_dir = os.path.dirname(PlinthConfig.LOG_FILE)
     if log_dir and not os.path.exists(log_dir):
         os.makedirs(log_dir, exist_ok=True)
-    
+
     # File handler
     file_handler = None
     try:
         file_handler = logging.FileHandler(PlinthConfig.LOG_FILE)
         file_handler.setLevel(PlinthConfig.LOG_LEVEL)
-        logger.addHandler(file_handler)
     except PermissionError:
         print(f"[WARN] Cannot write to {PlinthConfig.LOG_FILE}; logging to console only")
-    
+
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(PlinthConfig.LOG_LEVEL)
-    
+
     # Formatter
     formatter = logging.Formatter(
         '[%(asctime)s] [%(levelname)s] %(message)s',
@@ -137,7 +161,16 @@ def setup_logging():
     console_handler.setFormatter(formatter)
     if file_handler:
         file_handler.setFormatter(formatter)
-    
+
+    # Queue front-end; listener daemon thread drains to the real handlers
+    log_queue = queue.SimpleQueue()
+    real_handlers = [h for h in (file_handler, console_handler) if h]
+    listener = logging.handlers.QueueListener(
+        log_queue, *real_handlers, respect_handler_level=True
+    )
+    listener.start()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
     return logger
 
 logger = setup_logging()
@@ -173,7 +206,9 @@ class GPIOHandler:
         self.is_simulated = GPIO is None
         self.gpio_state = {}
         self.pulsing = False  # Track LED pulsing state
-        
+        self.edge_callbacks = {}  # gpio_pin -> callback(state)
+        self._last_brightness = -1  # Skip redundant PWM updates
+
         if not self.is_simulated:
             self._init_real_gpio()
         else:
@@ -204,6 +239,40 @@ class GPIOHandler:
             logger.error(f"GPIO initialization failed: {e}")
             self.is_simulated = True
     
+    def register_edge(self, gpio_pin, callback):
+        """
+        Register a callback for input edges on a pin.
+
+        The callback receives the debounced logical state (0/1) and is
+        invoked from RPi.GPIO's event thread. Debouncing is pushed into
+        the kernel via bouncetime, so no software debouncer is needed.
+        In simulation mode the callback is stored for the polling
+        fallback loop to invoke.
+        """
+        self.edge_callbacks[gpio_pin] = callback
+        if self.is_simulated:
+            logger.debug(f"[SIM] Edge callback registered for GPIO {gpio_pin}")
+            return
+        try:
+            GPIO.add_event_detect(
+                gpio_pin,
+                GPIO.BOTH,
+                callback=self._on_edge,
+                bouncetime=int(PlinthConfig.DEBOUNCE_DELAY * 1000)
+            )
+            logger.info(f"Edge detection enabled on GPIO {gpio_pin}")
+        except Exception as e:
+            logger.error(f"Error enabling edge detection on GPIO {gpio_pin}: {e}")
+
+    def _on_edge(self, gpio_pin):
+        """Dispatch a kernel edge event to the registered callback."""
+        callback = self.edge_callbacks.get(gpio_pin)
+        if callback:
+            try:
+                callback(self.read_input(gpio_pin))
+            except Exception as e:
+                logger.error(f"Error in edge callback for GPIO {gpio_pin}: {e}")
+
     def read_input(self, gpio_pin):
         """Read digital input (inverted for active-low buttons)."""
         if self.is_simulated:
@@ -219,7 +288,7 @@ class GPIOHandler:
         """Write digital output."""
         if self.is_simulated:
             self.gpio_state[gpio_pin] = value
-            logger.debug(f"[SIM] GPIO {gpio_pin} = {value}")
+            logger.debug("[SIM] GPIO %d = %d", gpio_pin, value)
             return
         try:
             GPIO.output(gpio_pin, value)
@@ -228,13 +297,17 @@ class GPIOHandler:
     
     def set_led_brightness(self, brightness):
         """Set LED brightness via PWM (0-255)."""
+        if brightness == self._last_brightness:
+            return  # PWM already at this duty cycle
         duty_cycle = (brightness / 255.0) * 100.0
         if self.is_simulated:
             self.gpio_state['led_brightness'] = brightness
-            logger.debug(f"[SIM] LED brightness = {brightness} ({duty_cycle:.1f}%)")
+            self._last_brightness = brightness
+            logger.debug("[SIM] LED brightness = %d (%.1f%%)", brightness, duty_cycle)
             return
         try:
             self.led_pwm.ChangeDutyCycle(duty_cycle)
+            self._last_brightness = brightness
         except Exception as e:
             logger.error(f"Error setting LED brightness: {e}")
     
@@ -248,7 +321,7 @@ class GPIOHandler:
             min_brightness: Minimum brightness (0-255)
         """
         if self.is_simulated:
-            logger.debug(f"[SIM] LED pulse started (freq={pulse_freq}Hz, max={max_brightness}, min={min_brightness})")
+            logger.debug("[SIM] LED pulse started (freq=%sHz, max=%d, min=%d)", pulse_freq, max_brightness, min_brightness)
             return
         
         def pulse_animation():
@@ -257,26 +330,23 @@ class GPIOHandler:
             half_cycle = cycle_time / 2.0
             step_duration = 0.02  # 20ms steps for smooth animation
             steps = int(half_cycle / step_duration)
-            
+
+            # The envelope is fixed by the three args, so precompute one
+            # full fade-in/fade-out cycle and just index it per tick.
+            brightness_range = max_brightness - min_brightness
+            table = (
+                [int(min_brightness + brightness_range * s / steps) for s in range(steps)]
+                + [int(max_brightness - brightness_range * s / steps) for s in range(steps)]
+            )
+            table_len = len(table)
+
             try:
+                i = 0
                 while self.pulsing:
-                    # Fade in (min -> max)
-                    brightness_range = max_brightness - min_brightness
-                    for step in range(steps):
-                        if not self.pulsing:
-                            return
-                        brightness = min_brightness + (brightness_range * step / steps)
-                        self.set_led_brightness(int(brightness))
-                        time.sleep(step_duration)
-                    
-                    # Fade out (max -> min)
-                    for step in range(steps):
-                        if not self.pulsing:
-                            return
-                        brightness = max_brightness - (brightness_range * step / steps)
-                        self.set_led_brightness(int(brightness))
-                        time.sleep(step_duration)
-                
+                    self.set_led_brightness(table[i])
+                    i = (i + 1) % table_len
+                    time.sleep(step_duration)
+
                 # Stop pulsing - turn LED off
                 self.set_led_brightness(0)
                 logger.debug("LED pulse animation stopped")
@@ -286,7 +356,7 @@ class GPIOHandler:
         self.pulsing = True
         pulse_thread = threading.Thread(target=pulse_animation, daemon=True)
         pulse_thread.start()
-        logger.debug(f"LED pulse started (freq={pulse_freq}Hz)")
+        logger.debug("LED pulse started (freq=%sHz)", pulse_freq)
     
     def stop_led_pulse(self):
         """Stop LED pulsing animation."""
@@ -314,23 +384,25 @@ class ButtonDebouncer:
         self.gpio_handler = gpio_handler
         self.gpio_pin = gpio_pin
         self.last_stable_state = 0
-        self.last_read_time = time.time()
-        self.read_history = deque(maxlen=3)
-    
+        self.last_read_time = time.monotonic()
+        # Rolling 3-bit shift register of recent reads; stable when all
+        # three bits agree (0b000 or 0b111). Cheaper than a deque + set.
+        self._shift = 0
+
     def read(self):
         """Read and debounce button state."""
-        now = time.time()
+        now = time.monotonic()
         if now - self.last_read_time < PlinthConfig.DEBOUNCE_DELAY:
             return self.last_stable_state
-        
+
         self.last_read_time = now
         current = self.gpio_handler.read_input(self.gpio_pin)
-        self.read_history.append(current)
-        
+        self._shift = ((self._shift << 1) | current) & 0b111
+
         # All recent reads must agree
-        if len(self.read_history) == 3 and len(set(self.read_history)) == 1:
+        if self._shift == 0 or self._shift == 0b111:
             self.last_stable_state = current
-        
+
         return self.last_stable_state
 
 # ============================================================================
@@ -338,69 +410,173 @@ class ButtonDebouncer:
 # ============================================================================
 
 class StepperMotor:
-    """Control stepper motor via STEP/DIR/ENABLE pins."""
-    
+    """
+    Control stepper motor via STEP/DIR/ENABLE pins.
+
+    When pigpio is available the STEP pulse train is generated as a DMA
+    waveform (microsecond-accurate, zero CPU while running); otherwise
+    each step is pulsed from the motor thread in software.
+    """
+
     def __init__(self, gpio_handler):
         self.gpio_handler = gpio_handler
         self.state = MotorState.IDLE
         self.current_position = 0  # 0 = closed, MOTOR_STEPS_OPEN = open
         self.target_position = 0
-        self.lock = threading.Lock()
-    
+        # Condition variable: open()/close() wake the motor thread,
+        # which otherwise sleeps while the motor is idle.
+        self.cv = threading.Condition()
+        self.pi = None  # pigpio connection (hardware waveform mode)
+        self._wave_active = False
+        # Bind hot-path names once: the software step path runs at
+        # 500 Hz, where repeated attribute/config lookups add up on the
+        # Pi's interpreter.
+        self._write = gpio_handler.write_output
+        self._pin_step = PlinthConfig.GPIO_MOTOR_STEP
+        self._pin_dir = PlinthConfig.GPIO_MOTOR_DIR
+        self._pin_enable = PlinthConfig.GPIO_MOTOR_ENABLE
+        self._init_pigpio()
+
+    def _init_pigpio(self):
+        """Connect to the pigpio daemon for hardware STEP waveforms."""
+        if self.gpio_handler.is_simulated or pigpio is None:
+            return
+        try:
+            pi = pigpio.pi()
+            if pi.connected:
+                pi.set_mode(PlinthConfig.GPIO_MOTOR_STEP, pigpio.OUTPUT)
+                self.pi = pi
+                logger.info("pigpio connected; STEP pulses generated via DMA waveform")
+            else:
+                logger.warning("pigpio daemon not running; using software stepping")
+        except Exception as e:
+            logger.error(f"pigpio initialization failed: {e}")
+            self.pi = None
+
+    def _start_wave(self):
+        """Build and send the full STEP train as one DMA waveform."""
+        steps = abs(self.target_position - self.current_position)
+        step_bit = 1 << PlinthConfig.GPIO_MOTOR_STEP
+        high_us = 1000  # 1 ms STEP pulse (matches software timing)
+        low_us = int(PlinthConfig.MOTOR_STEP_DELAY * 1_000_000)
+        self.pi.wave_clear()
+        self.pi.wave_add_generic(
+            [pigpio.pulse(step_bit, 0, high_us),
+             pigpio.pulse(0, step_bit, low_us)] * steps
+        )
+        wid = self.pi.wave_create()
+        self.pi.wave_send_once(wid)
+        self._wave_active = True
+
     def open(self):
         """Open the motor."""
-        with self.lock:
+        with self.cv:
             if self.state in [MotorState.IDLE, MotorState.CLOSED, MotorState.ERROR]:
                 self.state = MotorState.OPENING
                 self.target_position = PlinthConfig.MOTOR_STEPS_OPEN
                 logger.info(f"Plinth {PlinthConfig.PLINTH_ID}: Motor opening")
+                self._begin_move(direction=1)
+                self.cv.notify()
                 return True
         return False
-    
+
     def close(self):
         """Close the motor."""
-        with self.lock:
+        with self.cv:
             if self.state in [MotorState.IDLE, MotorState.OPEN, MotorState.ERROR]:
                 self.state = MotorState.CLOSING
                 self.target_position = 0
                 logger.info(f"Plinth {PlinthConfig.PLINTH_ID}: Motor closing")
+                self._begin_move(direction=-1)
+                self.cv.notify()
                 return True
         return False
-    
+
+    def _begin_move(self, direction):
+        """Set DIR/ENABLE and, in hardware mode, launch the STEP waveform."""
+        if self.pi is None:
+            return  # Software mode: execute_step drives the pins
+        try:
+            self.gpio_handler.write_output(
+                PlinthConfig.GPIO_MOTOR_DIR, 1 if direction == 1 else 0
+            )
+            self.gpio_handler.write_output(PlinthConfig.GPIO_MOTOR_ENABLE, 1)
+            self._start_wave()
+        except Exception as e:
+            logger.error(f"Error starting STEP waveform: {e}")
+            self._wave_active = False
+
     def stop(self):
         """Stop motor movement."""
-        with self.lock:
+        with self.cv:
+            if self._wave_active:
+                try:
+                    self.pi.wave_tx_stop()
+                except Exception as e:
+                    logger.error(f"Error stopping STEP waveform: {e}")
+                self._wave_active = False
+                # Steps already sent are unknown; position is approximate
+                # until the next full open/close completes.
             self.state = MotorState.IDLE
             self.gpio_handler.write_output(PlinthConfig.GPIO_MOTOR_ENABLE, 0)
-    
+            self.cv.notify()
+
+    def is_moving(self):
+        """Return True while a movement is in progress."""
+        return self.state in (MotorState.OPENING, MotorState.CLOSING)
+
     def execute_step(self):
-        """Execute one step cycle (run in background thread)."""
-        with self.lock:
-            if self.state == MotorState.IDLE:
-                return
-            
-            # Determine direction
-            if self.current_position < self.target_position:
-                direction = 1  # Open
-                self.gpio_handler.write_output(PlinthConfig.GPIO_MOTOR_DIR, 1)
-            else:
-                direction = -1  # Close
-                self.gpio_handler.write_output(PlinthConfig.GPIO_MOTOR_DIR, 0)
-            
-            # Enable motor, pulse step pin
-            self.gpio_handler.write_output(PlinthConfig.GPIO_MOTOR_ENABLE, 1)
-            self.gpio_handler.write_output(PlinthConfig.GPIO_MOTOR_STEP, 1)
-            time.sleep(0.001)  # 1 ms pulse
-            self.gpio_handler.write_output(PlinthConfig.GPIO_MOTOR_STEP, 0)
-            
-            # Update position
-            self.current_position += direction
-            
-            # Check if target reached
-            if self.current_position == self.target_position:
-                self.state = MotorState.OPEN if direction == 1 else MotorState.CLOSED
-                self.gpio_handler.write_output(PlinthConfig.GPIO_MOTOR_ENABLE, 0)
-                logger.info(f"Plinth {PlinthConfig.PLINTH_ID}: Motor {'opened' if direction == 1 else 'closed'}")
+        """Execute one step cycle (run in background thread while moving).
+
+        Runs without taking the condition variable: only this thread
+        mutates current_position, and the single-attribute reads/writes
+        of state/target_position are already atomic under the GIL. The
+        cv is only for idle wakeup (open/close/stop hold it to notify).
+        A stop() landing mid-step costs at most one extra pulse before
+        the motor loop observes IDLE.
+        """
+        if not self.is_moving():
+            return
+
+        # Hardware waveform mode: the DMA engine is pulsing STEP;
+        # just poll for completion.
+        if self._wave_active:
+            try:
+                if self.pi.wave_tx_busy():
+                    return
+            except Exception as e:
+                logger.error(f"Error polling STEP waveform: {e}")
+            self._wave_active = False
+            direction = 1 if self.state == MotorState.OPENING else -1
+            self.current_position = self.target_position
+            self.state = MotorState.OPEN if direction == 1 else MotorState.CLOSED
+            self.gpio_handler.write_output(PlinthConfig.GPIO_MOTOR_ENABLE, 0)
+            logger.info(f"Plinth {PlinthConfig.PLINTH_ID}: Motor {'opened' if direction == 1 else 'closed'}")
+            return
+
+        # Determine direction
+        write = self._write
+        if self.current_position < self.target_position:
+            direction = 1  # Open
+            write(self._pin_dir, 1)
+        else:
+            direction = -1  # Close
+            write(self._pin_dir, 0)
+
+        # Enable motor, pulse step pin
+        write(self._pin_enable, 1)
+        write(self._pin_step, 1)
+        time.sleep(0.001)  # 1 ms pulse
+        write(self._pin_step, 0)
+
+        # Update position
+        self.current_position += direction
+
+        # Check if target reached
+        if self.current_position == self.target_position:
+            self.state = MotorState.OPEN if direction == 1 else MotorState.CLOSED
+            write(self._pin_enable, 0)
+            logger.info(f"Plinth {PlinthConfig.PLINTH_ID}: Motor {'opened' if direction == 1 else 'closed'}")
 
 # ============================================================================
 # OSC Client (to Management Node)
@@ -412,6 +588,31 @@ class OSCClient:
     def __init__(self):
         self.client = None
         self.reconnect_count = 0
+        # PLINTH_ID is fixed per process, so build the hot-path OSC
+        # addresses once instead of formatting them on every event.
+        plinth_id = PlinthConfig.PLINTH_ID
+        self._addr_press = f"/plinth/{plinth_id}/button/press"
+        self._addr_release = f"/plinth/{plinth_id}/button/release"
+        self._addr_maint = f"/plinth/{plinth_id}/maintenance"
+        self._addr_heartbeat = f"/plinth/{plinth_id}/heartbeat"
+        # The hot-path messages are constant for a given process, so
+        # serialize each one once and send the cached bytes.
+        def _mk(address, value):
+            msg = osc_message_builder.OscMessageBuilder(address=address)
+            msg.add_arg(value)
+            return msg.build().dgram
+        self._dgram_cache = {
+            (self._addr_press, 1): _mk(self._addr_press, 1),
+            (self._addr_release, 0): _mk(self._addr_release, 0),
+            (self._addr_maint, 0): _mk(self._addr_maint, 0),
+            (self._addr_maint, 1): _mk(self._addr_maint, 1),
+            (self._addr_heartbeat, 1): _mk(self._addr_heartbeat, 1),
+        }
+        # Outgoing-event coalescing (see _queue/_flush)
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._flush_timer = None
+        self._send = None  # Bound to the connected socket's send()
         self._connect()
     
     def _connect(self):
@@ -421,6 +622,13 @@ class OSCClient:
                 PlinthConfig.MGMT_NODE_IP,
                 PlinthConfig.MGMT_NODE_PORT
             )
+            # The destination never changes, so connect() the UDP socket:
+            # send() then skips per-call sockaddr handling and the kernel
+            # caches the route. Also enlarge the send buffer for bursts.
+            sock = self.client._sock
+            sock.connect((PlinthConfig.MGMT_NODE_IP, PlinthConfig.MGMT_NODE_PORT))
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+            self._send = sock.send
             logger.info(
                 f"OSC client connected to {PlinthConfig.MGMT_NODE_IP}:"
                 f"{PlinthConfig.MGMT_NODE_PORT}"
@@ -430,30 +638,82 @@ class OSCClient:
             logger.error(f"Failed to connect OSC client: {e}")
             self.client = None
     
+    def _queue(self, address, value, flush_now=False):
+        """
+        Queue an event for sending.
+
+        Events queued within OSC_COALESCE_WINDOW are flushed together as
+        a single OSC bundle (one datagram). Latency-critical events pass
+        flush_now=True to send immediately along with anything pending.
+        """
+        if not self.client:
+            return
+        with self._pending_lock:
+            self._pending.append((address, value))
+            if flush_now:
+                if self._flush_timer:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(
+                    PlinthConfig.OSC_COALESCE_WINDOW, self._flush
+                )
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+                return
+            else:
+                return
+        self._flush()
+
+    def _flush(self):
+        """Send all queued events (single message or one bundle)."""
+        with self._pending_lock:
+            pending = self._pending
+            self._pending = []
+            self._flush_timer = None
+        if not pending:
+            return
+        try:
+            if len(pending) == 1:
+                dgram = self._dgram_cache.get(pending[0])
+                if dgram is None:
+                    msg = osc_message_builder.OscMessageBuilder(address=pending[0][0])
+                    msg.add_arg(pending[0][1])
+                    dgram = msg.build().dgram
+                self._send(dgram)
+            else:
+                bundle = osc_bundle_builder.OscBundleBuilder(
+                    osc_bundle_builder.IMMEDIATELY
+                )
+                for address, value in pending:
+                    msg = osc_message_builder.OscMessageBuilder(address=address)
+                    msg.add_arg(value)
+                    bundle.add_content(msg.build())
+                self._send(bundle.build().dgram)
+        except Exception as e:
+            logger.error(f"Error sending OSC events: {e}")
+
     def send_button_press(self):
-        """Send button press event."""
-        if self.client:
-            try:
-                self.client.send_message(f"/plinth/{PlinthConfig.PLINTH_ID}/button/press", 1)
-            except Exception as e:
-                logger.error(f"Error sending button press: {e}")
-    
+        """Send button press event (immediate; latency-critical)."""
+        self._queue(self._addr_press, 1, flush_now=True)
+
     def send_button_release(self):
         """Send button release event."""
-        if self.client:
-            try:
-                self.client.send_message(f"/plinth/{PlinthConfig.PLINTH_ID}/button/release", 0)
-            except Exception as e:
-                logger.error(f"Error sending button release: {e}")
-    
+        self._queue(self._addr_release, 0)
+
     def send_maintenance_state(self, state):
         """Send maintenance switch state."""
-        if self.client:
-            try:
-                self.client.send_message(f"/plinth/{PlinthConfig.PLINTH_ID}/maintenance", state)
-            except Exception as e:
-                logger.error(f"Error sending maintenance state: {e}")
-    
+        self._queue(self._addr_maint, state)
+
+    def send_heartbeat(self):
+        """Send watchdog heartbeat to management node."""
+        if not self.client:
+            return
+        try:
+            self._send(self._dgram_cache[(self._addr_heartbeat, 1)])
+        except Exception as e:
+            logger.error(f"Failed to send heartbeat: {e}")
+
     def reconnect(self):
         """Attempt reconnection."""
         self.reconnect_count += 1
@@ -466,86 +726,214 @@ class OSCClient:
 # OSC Server (receive from Management Node)
 # ============================================================================
 
+class _PlinthOSCUDPServer(osc_server.BlockingOSCUDPServer):
+    """BlockingOSCUDPServer with tuned socket options.
+
+    Enlarges the UDP receive buffer so bursty command storms are not
+    silently dropped, and sets SO_REUSEPORT so a restarted service can
+    rebind immediately.
+    """
+
+    def server_bind(self):
+        self.socket.setsockopt(
+            socket.SOL_SOCKET, socket.SO_RCVBUF, PlinthConfig.OSC_RCVBUF_SIZE
+        )
+        if hasattr(socket, 'SO_REUSEPORT'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
 class OSCServer:
-    """Receive OSC commands from management node."""
-    
-    def __init__(self, stepper, gpio_handler, osc_client):
-        self.stepper = stepper
-        self.gpio_handler = gpio_handler
+    """
+    Receive OSC commands from management node.
+
+    One BlockingOSCUDPServer on a single long-lived thread handles all
+    commands sequentially — no per-message thread spawn. Commands are
+    routed by address, so additional plinths hosted on the same machine
+    can share this server via register_plinth() instead of binding
+    their own sockets.
+    """
+
+    def __init__(self, stepper, gpio_handler, osc_client, port=None):
         self.osc_client = osc_client
+        self.plinths = {}  # plinth_id -> (stepper, gpio_handler)
         self.dispatcher = Dispatcher()
         self.server = None
-        
-        # Register handlers
-        self._register_handlers()
+        self.port = port if port is not None else PlinthConfig.LOCAL_OSC_PORT
+
+        self.register_plinth(PlinthConfig.PLINTH_ID, stepper, gpio_handler)
         self._start_server()
-    
-    def _register_handlers(self):
-        """Register OSC message handlers."""
-        plinth_id = PlinthConfig.PLINTH_ID
-        
-        self.dispatcher.map(f"/plinth/{plinth_id}/motor/open", self._handle_motor_open)
-        self.dispatcher.map(f"/plinth/{plinth_id}/motor/close", self._handle_motor_close)
-        self.dispatcher.map(f"/plinth/{plinth_id}/led", self._handle_led)
-        self.dispatcher.map(f"/plinth/{plinth_id}/led/pulse", self._handle_led_pulse)
-        self.dispatcher.map(f"/plinth/{plinth_id}/led/off", self._handle_led_off)
-        self.dispatcher.map(f"/plinth/{plinth_id}/enable", self._handle_enable)
-        self.dispatcher.map(f"/plinth/{plinth_id}/disable", self._handle_disable)
-    
+
+    def register_plinth(self, plinth_id, stepper, gpio_handler):
+        """Route /plinth/{id}/... commands to the given hardware."""
+        self.plinths[plinth_id] = (stepper, gpio_handler)
+        prefix = f"/plinth/{plinth_id}"
+
+        self.dispatcher.map(prefix + "/motor/open", self._handle_motor_open)
+        self.dispatcher.map(prefix + "/motor/close", self._handle_motor_close)
+        self.dispatcher.map(prefix + "/led", self._handle_led)
+        self.dispatcher.map(prefix + "/led/pulse", self._handle_led_pulse)
+        self.dispatcher.map(prefix + "/led/off", self._handle_led_off)
+        self.dispatcher.map(prefix + "/enable", self._handle_enable)
+        self.dispatcher.map(prefix + "/disable", self._handle_disable)
+
+    def _target(self, addr):
+        """Look up (stepper, gpio_handler) from the /plinth/{id} prefix."""
+        return self.plinths[int(addr.split('/')[2])]
+
     def _start_server(self):
         """Start OSC server thread."""
         try:
-            self.server = osc_server.ThreadingOSCUDPServer(
-                ("0.0.0.0", PlinthConfig.LOCAL_OSC_PORT),
+            self.server = _PlinthOSCUDPServer(
+                ("0.0.0.0", self.port),
                 self.dispatcher
             )
             thread = threading.Thread(target=self.server.serve_forever, daemon=True)
             thread.start()
-            logger.info(f"OSC server listening on port {PlinthConfig.LOCAL_OSC_PORT}")
+            logger.info(f"OSC server listening on port {self.port}")
         except Exception as e:
             logger.error(f"Failed to start OSC server: {e}")
     
     def _handle_motor_open(self, addr, value):
         """Handle motor open command."""
-        logger.info(f"Received motor open command")
-        self.stepper.open()
-    
+        logger.debug("Received motor open command")
+        stepper, _ = self._target(addr)
+        stepper.open()
+
     def _handle_motor_close(self, addr, value):
         """Handle motor close command."""
-        logger.info(f"Received motor close command")
-        self.stepper.close()
-    
+        logger.debug("Received motor close command")
+        stepper, _ = self._target(addr)
+        stepper.close()
+
     def _handle_led(self, addr, brightness):
         """Handle LED brightness command."""
         brightness = max(0, min(255, int(brightness)))
-        logger.debug(f"LED brightness set to {brightness}")
-        self.gpio_handler.stop_led_pulse()  # Stop any ongoing pulse
-        self.gpio_handler.set_led_brightness(brightness)
-    
+        logger.debug("LED brightness set to %d", brightness)
+        _, gpio_handler = self._target(addr)
+        gpio_handler.stop_led_pulse()  # Stop any ongoing pulse
+        gpio_handler.set_led_brightness(brightness)
+
     def _handle_led_pulse(self, addr, value):
         """Handle LED pulsing command (bang type)."""
         logger.info("LED pulse effect started")
+        _, gpio_handler = self._target(addr)
         # Pulse with 2Hz frequency, 255 max brightness, 50 min brightness
-        self.gpio_handler.start_led_pulse(pulse_freq=2.0, max_brightness=255, min_brightness=50)
-    
+        gpio_handler.start_led_pulse(pulse_freq=2.0, max_brightness=255, min_brightness=50)
+
     def _handle_led_off(self, addr, value):
         """Handle LED off command."""
         logger.debug("LED turned off")
-        self.gpio_handler.stop_led_pulse()  # Stop any ongoing pulse
-        self.gpio_handler.set_led_brightness(0)
-    
+        _, gpio_handler = self._target(addr)
+        gpio_handler.stop_led_pulse()  # Stop any ongoing pulse
+        gpio_handler.set_led_brightness(0)
+
     def _handle_enable(self, addr, value):
         """Handle enable command."""
         logger.info("Plinth enabled")
+        _, gpio_handler = self._target(addr)
         # Set LED to indicate enabled
-        self.gpio_handler.set_led_brightness(100)
-    
+        gpio_handler.set_led_brightness(100)
+
     def _handle_disable(self, addr, value):
         """Handle disable command."""
         logger.info("Plinth disabled")
+        stepper, gpio_handler = self._target(addr)
         # Set LED to indicate disabled
-        self.gpio_handler.set_led_brightness(0)
-        self.stepper.stop()
+        gpio_handler.set_led_brightness(0)
+        stepper.stop()
+
+# ============================================================================
+# GPIO Event Reactor (sysfs + epoll)
+# ============================================================================
+
+class GPIOEventReactor:
+    """
+    Deliver input edges via epoll on sysfs GPIO value files.
+
+    One daemon thread blocks in epoll_wait on the exported
+    /sys/class/gpio/gpioN/value files with edge='both', so button and
+    maintenance transitions arrive as kernel wakeups with zero idle CPU
+    and no RPi.GPIO callback-thread hops. Used on hardware where the
+    sysfs GPIO interface is present; RPi.GPIO edge detection is the
+    fallback.
+    """
+
+    SYSFS_GPIO = "/sys/class/gpio"
+
+    def __init__(self):
+        self.epoll = select.epoll()
+        self.pins = {}  # fd -> (value_file, callback)
+        self._last_event = {}  # fd -> monotonic time of last delivered edge
+        self.running = False
+        self.thread = None
+
+    @classmethod
+    def available(cls):
+        """Return True if the sysfs GPIO interface exists on this host."""
+        return os.path.isdir(cls.SYSFS_GPIO)
+
+    def add_pin(self, gpio_pin, callback):
+        """
+        Export a pin, arm both-edge reporting, and register a callback.
+
+        The callback receives the logical state (0/1, inverted for the
+        active-low wiring used on the plinth inputs).
+        """
+        base = f"{self.SYSFS_GPIO}/gpio{gpio_pin}"
+        if not os.path.isdir(base):
+            with open(f"{self.SYSFS_GPIO}/export", 'w') as f:
+                f.write(str(gpio_pin))
+        with open(f"{base}/edge", 'w') as f:
+            f.write("both")
+        value_file = open(f"{base}/value", 'rb', buffering=0)
+        self.epoll.register(value_file.fileno(), select.EPOLLPRI | select.EPOLLERR)
+        self.pins[value_file.fileno()] = (value_file, callback)
+        self._last_event[value_file.fileno()] = 0.0
+        logger.info(f"epoll edge reporting armed on GPIO {gpio_pin}")
+
+    def start(self):
+        """Start the reactor thread."""
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the reactor and release file descriptors."""
+        self.running = False
+
+    def _read_state(self, value_file):
+        """Read and invert the pin value (active-low inputs)."""
+        value_file.seek(0)
+        raw = value_file.read().strip()
+        return 0 if raw == b'1' else 1
+
+    def _run(self):
+        """Reactor loop: wait for edges and dispatch callbacks."""
+        # Clear the initial pending-readable state on each fd
+        for value_file, _ in self.pins.values():
+            value_file.read()
+        while self.running:
+            try:
+                for fd, _event in self.epoll.poll(1.0):
+                    value_file, callback = self.pins[fd]
+                    state = self._read_state(value_file)
+                    # Contact bounce arrives as an edge burst; suppress
+                    # edges inside the debounce window
+                    now = time.monotonic()
+                    if now - self._last_event[fd] < PlinthConfig.DEBOUNCE_DELAY:
+                        continue
+                    self._last_event[fd] = now
+                    callback(state)
+            except Exception as e:
+                logger.error(f"Error in GPIO event reactor: {e}")
+                time.sleep(0.1)
+        for value_file, _ in self.pins.values():
+            try:
+                self.epoll.unregister(value_file.fileno())
+                value_file.close()
+            except OSError:
+                pass
 
 # ============================================================================
 # Main Controller
@@ -558,7 +946,10 @@ class PlinthController:
         self.gpio_handler = GPIOHandler()
         self.stepper = StepperMotor(self.gpio_handler)
         self.button_debouncer = ButtonDebouncer(self.gpio_handler, PlinthConfig.GPIO_BUTTON)
-        self.maint_debouncer = ButtonDebouncer(self.gpio_handler, PlinthConfig.GPIO_MAINTENANCE)
+        # The maintenance switch is a mechanical latching toggle; a full
+        # software debouncer is overkill. Two matching raw reads 10 ms
+        # apart (see _input_loop) are confirmation enough.
+        self._last_maint_raw = 0
         self.osc_client = OSCClient()
         self.osc_server = OSCServer(self.stepper, self.gpio_handler, self.osc_client)
         
@@ -567,80 +958,136 @@ class PlinthController:
         self.maintenance_pressed = False
         self.button_press_time = None
         self.plinth_state = PlinthState.IDLE
-        
+        self.maintenance_timer = None  # Long-hold timer, armed on press
+
+        # Input delivery, best mechanism first: epoll on sysfs GPIO
+        # (single reactor thread, no RPi.GPIO callback hops), then
+        # RPi.GPIO kernel edge interrupts, then the polling fallback
+        # thread in simulation mode.
+        self.gpio_reactor = None
+        if not self.gpio_handler.is_simulated and GPIOEventReactor.available():
+            try:
+                reactor = GPIOEventReactor()
+                reactor.add_pin(PlinthConfig.GPIO_BUTTON, self._on_button_edge)
+                reactor.add_pin(PlinthConfig.GPIO_MAINTENANCE, self._on_maint_edge)
+                self.gpio_reactor = reactor
+            except OSError as e:
+                logger.warning(f"sysfs GPIO reactor unavailable ({e}); using RPi.GPIO edge detection")
+        if self.gpio_reactor is None:
+            self.gpio_handler.register_edge(PlinthConfig.GPIO_BUTTON, self._on_button_edge)
+            self.gpio_handler.register_edge(PlinthConfig.GPIO_MAINTENANCE, self._on_maint_edge)
+
         # Threads
         self.running = True
-        self.input_thread = threading.Thread(target=self._input_loop, daemon=True)
+        self.input_thread = None
+        if self.gpio_handler.is_simulated:
+            self.input_thread = threading.Thread(target=self._input_loop, daemon=True)
         self.motor_thread = threading.Thread(target=self._motor_loop, daemon=True)
         self.watchdog_thread = threading.Thread(target=self._watchdog_loop, daemon=True)
-    
+
     def start(self):
         """Start controller threads."""
         logger.info(f"Starting Plinth {PlinthConfig.PLINTH_ID} Controller")
-        self.input_thread.start()
+        if self.gpio_reactor:
+            self.gpio_reactor.start()
+        if self.input_thread:
+            self.input_thread.start()
         self.motor_thread.start()
         self.watchdog_thread.start()
-    
+
     def stop(self):
         """Stop controller gracefully."""
         logger.info("Stopping plinth controller")
         self.running = False
+        if self.gpio_reactor:
+            self.gpio_reactor.stop()
         self.stepper.stop()
         self.gpio_handler.cleanup()
         time.sleep(0.5)
     
+    def _on_button_edge(self, state):
+        """Handle a button edge (called from GPIO event thread)."""
+        if state and not self.button_pressed:
+            # Button pressed
+            self.button_pressed = True
+            self.button_press_time = time.monotonic()
+            logger.info("Button pressed")
+            self.osc_client.send_button_press()
+            # Arm long-hold timer for maintenance mode
+            self.maintenance_timer = threading.Timer(
+                PlinthConfig.MAINTENANCE_HOLD_TIME, self._enter_maintenance
+            )
+            self.maintenance_timer.daemon = True
+            self.maintenance_timer.start()
+
+        elif not state and self.button_pressed:
+            # Button released
+            self.button_pressed = False
+            if self.maintenance_timer:
+                self.maintenance_timer.cancel()
+                self.maintenance_timer = None
+            hold_time = time.monotonic() - self.button_press_time
+            logger.info("Button released (held %.2fs)", hold_time)
+            self.osc_client.send_button_release()
+
+    def _on_maint_edge(self, state):
+        """Handle a maintenance switch edge (called from GPIO event thread)."""
+        if state != self.maintenance_pressed:
+            self.maintenance_pressed = state
+            logger.info("Maintenance switch: %s", state)
+            self.osc_client.send_maintenance_state(state)
+
+    def _enter_maintenance(self):
+        """Enter maintenance mode after the button has been held 4 seconds."""
+        if not self.button_pressed:
+            return
+        logger.warning(
+            f"Maintenance mode activated (button held {PlinthConfig.MAINTENANCE_HOLD_TIME:.0f}s)"
+        )
+        self.plinth_state = PlinthState.MAINTENANCE
+        # Toggle motor open/close in maintenance
+        if self.stepper.state == MotorState.CLOSED:
+            self.stepper.open()
+        else:
+            self.stepper.close()
+
     def _input_loop(self):
-        """Monitor button and maintenance switch."""
+        """Poll inputs and synthesize edges (simulation-mode fallback only)."""
         while self.running:
             try:
-                # Read debounced button
                 button = self.button_debouncer.read()
-                
-                if button and not self.button_pressed:
-                    # Button pressed
-                    self.button_pressed = True
-                    self.button_press_time = time.time()
-                    logger.info(f"Button pressed")
-                    self.osc_client.send_button_press()
-                
-                elif not button and self.button_pressed:
-                    # Button released
-                    self.button_pressed = False
-                    hold_time = time.time() - self.button_press_time
-                    logger.info(f"Button released (held {hold_time:.2f}s)")
-                    self.osc_client.send_button_release()
-                
-                # Maintenance mode (4-second hold)
-                if self.button_pressed:
-                    hold_time = time.time() - self.button_press_time
-                    if hold_time > PlinthConfig.MAINTENANCE_HOLD_TIME:
-                        logger.warning(f"Maintenance mode activated (button held {hold_time:.2f}s)")
-                        self.plinth_state = PlinthState.MAINTENANCE
-                        # Toggle motor open/close in maintenance
-                        if self.stepper.state == MotorState.CLOSED:
-                            self.stepper.open()
-                        else:
-                            self.stepper.close()
-                
-                # Read maintenance switch
-                maint = self.maint_debouncer.read()
-                if maint != self.maintenance_pressed:
-                    self.maintenance_pressed = maint
-                    logger.info(f"Maintenance switch: {maint}")
-                    self.osc_client.send_maintenance_state(maint)
-                
+                if button != self.button_pressed:
+                    self._on_button_edge(button)
+
+                # Two-in-a-row confirmation = 20 ms debounce at the
+                # 10 ms poll rate, with no debouncer state to maintain
+                maint = self.gpio_handler.read_input(PlinthConfig.GPIO_MAINTENANCE)
+                if maint != self.maintenance_pressed and maint == self._last_maint_raw:
+                    self._on_maint_edge(maint)
+                self._last_maint_raw = maint
+
                 time.sleep(0.01)  # 10 ms loop
-            
+
             except Exception as e:
                 logger.error(f"Error in input loop: {e}")
                 time.sleep(0.1)
     
     def _motor_loop(self):
-        """Drive stepper motor."""
+        """Drive stepper motor (sleeps on the condition variable while idle)."""
+        stepper = self.stepper
         while self.running:
             try:
-                self.stepper.execute_step()
-                time.sleep(PlinthConfig.MOTOR_STEP_DELAY)
+                # Sleep until open()/close() signals work (timeout so the
+                # loop can observe shutdown).
+                with stepper.cv:
+                    while self.running and not stepper.is_moving():
+                        stepper.cv.wait(timeout=1.0)
+
+                # Step at MOTOR_STEP_DELAY until the target is reached
+                # or the movement is cancelled.
+                while self.running and stepper.is_moving():
+                    stepper.execute_step()
+                    time.sleep(PlinthConfig.MOTOR_STEP_DELAY)
             except Exception as e:
                 logger.error(f"Error in motor loop: {e}")
                 time.sleep(0.1)
@@ -659,14 +1106,8 @@ class PlinthController:
                 # Send periodic heartbeat every 5 seconds
                 heartbeat_counter += 1
                 if heartbeat_counter >= 5:
-                    if self.osc_client.client:
-                        try:
-                            self.osc_client.client.send_message(
-                                f"/plinth/{PlinthConfig.PLINTH_ID}/heartbeat", 1
-                            )
-                            logger.debug(f"Heartbeat sent to management node")
-                        except Exception as e:
-                            logger.error(f"Failed to send heartbeat: {e}")
+                    self.osc_client.send_heartbeat()
+                    logger.debug("Heartbeat sent to management node")
                     heartbeat_counter = 0
                 
                 time.sleep(1.0)  # Check every 1 second (for better heartbeat timing)
@@ -0,0 +1,157 @@
+/*
+ * _fastsend: native press/release send loop for simulate_button.py.
+ *
+ * Runs the entire timing loop in C with the GIL released: one
+ * PyArg_ParseTuple on entry, one Py_RETURN_NONE on exit, and nothing
+ * but send(2) + clock_nanosleep(2) in between. Deadlines are absolute
+ * (CLOCK_MONOTONIC) so the schedule does not drift over long runs.
+ * When press_ns == interval_ns == 0 (stress mode) the press/release
+ * pairs are batched through sendmmsg(2) instead.
+ *
+ * Build:  python setup.py build_ext --inplace   (from tests/)
+ */
+
+#define _GNU_SOURCE
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include <errno.h>
+#include <string.h>
+#include <sys/socket.h>
+#include <time.h>
+
+#define FASTSEND_BATCH 64
+
+static long long
+now_ns(void)
+{
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (long long)ts.tv_sec * 1000000000LL + ts.tv_nsec;
+}
+
+static void
+sleep_until_ns(long long deadline_ns)
+{
+    struct timespec ts;
+    ts.tv_sec = deadline_ns / 1000000000LL;
+    ts.tv_nsec = deadline_ns % 1000000000LL;
+    while (clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, &ts, NULL) == EINTR)
+        ;
+}
+
+/* send() retrying on EAGAIN/EINTR; the caller's socket is usually
+ * non-blocking with an enlarged SO_SNDBUF, so retries are rare. */
+static int
+send_one(int fd, const void *buf, size_t len)
+{
+    for (;;) {
+        if (send(fd, buf, len, 0) >= 0)
+            return 0;
+        if (errno != EAGAIN && errno != EWOULDBLOCK && errno != EINTR)
+            return errno;
+    }
+}
+
+static int
+run_stress(int fd, Py_buffer *press, Py_buffer *release, long long count)
+{
+    struct mmsghdr hdrs[FASTSEND_BATCH];
+    struct iovec iovs[FASTSEND_BATCH];
+    long long total = count * 2;
+    long long done = 0;
+
+    while (done < total) {
+        long long left = total - done;
+        int n = left < FASTSEND_BATCH ? (int)left : FASTSEND_BATCH;
+        int i, sent;
+
+        for (i = 0; i < n; i++) {
+            Py_buffer *b = ((done + i) & 1) ? release : press;
+            iovs[i].iov_base = b->buf;
+            iovs[i].iov_len = (size_t)b->len;
+            memset(&hdrs[i].msg_hdr, 0, sizeof(struct msghdr));
+            hdrs[i].msg_hdr.msg_iov = &iovs[i];
+            hdrs[i].msg_hdr.msg_iovlen = 1;
+        }
+        sent = sendmmsg(fd, hdrs, (unsigned int)n, 0);
+        if (sent < 0) {
+            if (errno == EAGAIN || errno == EWOULDBLOCK || errno == EINTR)
+                continue;
+            return errno;
+        }
+        done += sent;
+    }
+    return 0;
+}
+
+static int
+run_timed(int fd, Py_buffer *press, Py_buffer *release, long long count,
+          long long press_ns, long long interval_ns)
+{
+    long long base = now_ns();
+    long long i;
+    int err;
+
+    for (i = 0; i < count; i++) {
+        if ((err = send_one(fd, press->buf, (size_t)press->len)) != 0)
+            return err;
+        sleep_until_ns(base + i * interval_ns + press_ns);
+        if ((err = send_one(fd, release->buf, (size_t)release->len)) != 0)
+            return err;
+        if (i != count - 1)
+            sleep_until_ns(base + (i + 1) * interval_ns);
+    }
+    return 0;
+}
+
+static PyObject *
+fastsend_run(PyObject *self, PyObject *args)
+{
+    int fd;
+    Py_buffer press, release;
+    long long count, press_ns, interval_ns;
+    int err;
+
+    if (!PyArg_ParseTuple(args, "iy*y*LLL:run", &fd, &press, &release,
+                          &count, &press_ns, &interval_ns))
+        return NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    if (press_ns == 0 && interval_ns == 0)
+        err = run_stress(fd, &press, &release, count);
+    else
+        err = run_timed(fd, &press, &release, count, press_ns, interval_ns);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&press);
+    PyBuffer_Release(&release);
+
+    if (err) {
+        errno = err;
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef fastsend_methods[] = {
+    {"run", fastsend_run, METH_VARARGS,
+     "run(fd, press_bytes, release_bytes, count, press_ns, interval_ns)\n"
+     "Send count press/release pairs on a connected datagram socket\n"
+     "with absolute-deadline pacing, entirely in C with the GIL released."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef fastsend_module = {
+    PyModuleDef_HEAD_INIT,
+    "_fastsend",
+    "Native send loop for the button-press simulator.",
+    -1,
+    fastsend_methods
+};
+
+PyMODINIT_FUNC
+PyInit__fastsend(void)
+{
+    return PyModule_Create(&fastsend_module);
+}
@@ -14,6 +14,7 @@ Examples:
 import sys
 import time
 from pythonosc import udp_client
+from pythonosc.osc_message_builder import OscMessageBuilder
 
 def main():
     if len(sys.argv) < 4:
@@ -41,7 +42,17 @@ def main():
     # Send OSC message
     try:
         client = udp_client.SimpleUDPClient(host, port)
-        client.send_message(address, args)
+        # Build the message once with explicit arg types; avoids the
+        # per-argument isinstance dispatch inside python-osc
+        builder = OscMessageBuilder(address=address)
+        for arg in args:
+            if isinstance(arg, int):
+                builder.add_arg(arg, OscMessageBuilder.ARG_TYPE_INT)
+            elif isinstance(arg, float):
+                builder.add_arg(arg, OscMessageBuilder.ARG_TYPE_FLOAT)
+            else:
+                builder.add_arg(arg, OscMessageBuilder.ARG_TYPE_STRING)
+        client._sock.sendto(builder.build().dgram, (host, port))
         print(f"[OK] Sent to {host}:{port}")
         print(f"     Address: {address}")
         if args:
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Build the optional _fastsend extension for simulate_button.py.
+
+Usage:
+  python3 setup.py build_ext --inplace
+
+simulate_button.py falls back to its pure-Python send loop when the
+extension has not been built.
+"""
+
+from setuptools import setup, Extension
+
+setup(
+    name='_fastsend',
+    ext_modules=[Extension('_fastsend', ['fastsend.c'])],
+)
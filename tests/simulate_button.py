@@ -10,29 +10,457 @@ Examples:
   python3 simulate_button.py 192.168.1.11 6000 --press-duration 0.5 --interval 3 --count 10
 """
 
+import os
 import sys
 import time
-import argparse
-from pythonosc import udp_client
-
-def simulate_button_press(client, address, press_duration, interval, count):
-    """Simulate button presses."""
-    for i in range(count):
-        print(f"[{i+1}/{count}] Button press at {time.strftime('%H:%M:%S')}")
-        
-        # Send button press
-        client.send_message(f"{address}/button/press", [1])
-        time.sleep(press_duration)
-        
-        # Send button release
-        client.send_message(f"{address}/button/release", [0])
-        
-        if i < count - 1:
-            time.sleep(interval - press_duration)
-    
-    print(f"\nCompleted {count} button presses")
+import types
+import ctypes
+import errno
+import select
+import socket
+import struct
+from pythonosc.parsing.osc_types import write_date
 
-def main():
+try:
+    # Optional: vectorizes the deadline timeline for large --count
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    # Optional: io_uring submission-queue batching for --io-uring runs
+    import liburing
+except ImportError:
+    liburing = None
+
+try:
+    # Optional: native send loop (build with `python3 setup.py
+    # build_ext --inplace` in this directory); used for silent runs
+    # where no per-press progress output is needed
+    import _fastsend
+except ImportError:
+    _fastsend = None
+
+# ----------------------------------------------------------------------------
+# sendmmsg(2) batching (Linux): pack many datagrams into one syscall
+# ----------------------------------------------------------------------------
+
+SENDMMSG_BATCH = 64  # datagrams per syscall
+
+class _iovec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p),
+                ("iov_len", ctypes.c_size_t)]
+
+class _msghdr(ctypes.Structure):
+    _fields_ = [("msg_name", ctypes.c_void_p),
+                ("msg_namelen", ctypes.c_uint),
+                ("msg_iov", ctypes.POINTER(_iovec)),
+                ("msg_iovlen", ctypes.c_size_t),
+                ("msg_control", ctypes.c_void_p),
+                ("msg_controllen", ctypes.c_size_t),
+                ("msg_flags", ctypes.c_int)]
+
+class _mmsghdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _msghdr),
+                ("msg_len", ctypes.c_uint)]
+
+try:
+    _libc = ctypes.CDLL("libc.so.6", use_errno=True)
+    _libc.sendmmsg
+except (OSError, AttributeError):
+    _libc = None  # Non-Linux: fall back to one send per datagram
+
+# ----------------------------------------------------------------------------
+# Absolute-deadline sleeping: clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME)
+# ----------------------------------------------------------------------------
+
+CLOCK_MONOTONIC = 1
+TIMER_ABSTIME = 1
+EINTR = 4
+
+class _timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long),
+                ("tv_nsec", ctypes.c_long)]
+
+# Below this remaining time, spin instead of sleeping: the kernel can't
+# reliably wake a thread in under ~tens of µs, so very short press
+# durations (chatter/debounce testing) would otherwise all round up.
+# Overridden by --spin-threshold-us.
+SPIN_THRESHOLD_NS = 200_000
+
+try:
+    _clock_nanosleep = _libc.clock_nanosleep if _libc else None
+except AttributeError:
+    _clock_nanosleep = None
+
+def sleep_until(deadline_ns):
+    """Sleep until an absolute CLOCK_MONOTONIC time in nanoseconds.
+
+    Absolute deadlines keep the nominal schedule exact: relative
+    time.sleep calls each return 'at least N' late and the error
+    accumulates over a long run. Deadlines closer than SPIN_THRESHOLD_NS
+    are busy-waited on the monotonic clock — burning one core briefly
+    buys sub-µs accuracy where a kernel sleep would oversleep by tens
+    of µs.
+    """
+    monotonic_ns = time.monotonic_ns
+    if deadline_ns - monotonic_ns() < SPIN_THRESHOLD_NS:
+        while monotonic_ns() < deadline_ns:
+            pass
+        return
+    if _clock_nanosleep is None:
+        delta_s = (deadline_ns - monotonic_ns()) / 1e9
+        if delta_s > 0:
+            time.sleep(delta_s)
+        return
+    ts = _timespec(deadline_ns // 1_000_000_000, deadline_ns % 1_000_000_000)
+    while _clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME,
+                           ctypes.byref(ts), None) == EINTR:
+        pass
+
+MCL_CURRENT = 1
+MCL_FUTURE = 2
+
+def pin_and_elevate(cpu, realtime):
+    """Reduce scheduling jitter for the timing loop.
+
+    Pinning to one CPU removes migration jitter; SCHED_FIFO (needs
+    CAP_SYS_NICE or root) removes preemption by ordinary tasks; mlockall
+    keeps the Python heap resident so a page fault never lands inside a
+    press window. Each step degrades independently with a warning.
+    """
+    if cpu is not None:
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except OSError as e:
+            print(f"[WARN] could not pin to CPU {cpu}: {e}")
+    if realtime:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(50))
+        except (OSError, PermissionError) as e:
+            print(f"[WARN] SCHED_FIFO unavailable (run as root?): {e}")
+        if _libc is not None:
+            _libc.mlockall(MCL_CURRENT | MCL_FUTURE)
+
+# "#bundle" marker plus the IMMEDIATELY timetag (0.0.0.1 in NTP terms)
+_BUNDLE_HEADER = b"#bundle\x00" + b"\x00\x00\x00\x00\x00\x00\x00\x01"
+
+def osc_pad(s):
+    """Encode an OSC string: NUL-terminated, padded to a 4-byte boundary."""
+    b = s.encode() + b"\x00"
+    return b + b"\x00" * ((4 - len(b) % 4) % 4)
+
+def build_message(address, value):
+    """Serialize one int-argument OSC message to raw datagram bytes.
+
+    The wire format is just padded address + padded ",i" typetag +
+    big-endian int32, so it is assembled directly instead of going
+    through OscMessageBuilder's per-call dispatch; the addresses never
+    change, so each datagram is built exactly once at startup.
+    """
+    return osc_pad(address) + osc_pad(",i") + struct.pack(">i", value)
+
+def build_bundle_template(address):
+    """Pre-serialize a press+release OSC bundle for --bundle mode.
+
+    The press fires immediately; the release rides in a nested bundle
+    whose timetag the receiver is expected to honor. Returns the bundle
+    as a mutable bytearray plus the byte offset of that nested timetag,
+    so each tick patches 8 bytes (now + press_duration) instead of
+    re-serializing the whole bundle.
+    """
+    press = build_message(f"{address}/button/press", 1)
+    release = build_message(f"{address}/button/release", 0)
+    inner = _BUNDLE_HEADER + struct.pack(">i", len(release)) + release
+    outer = (_BUNDLE_HEADER
+             + struct.pack(">i", len(press)) + press
+             + struct.pack(">i", len(inner)) + inner)
+    # header + timetag + size-prefixed press + size prefix + inner header
+    timetag_offset = 8 + 8 + 4 + len(press) + 4 + 8
+    return bytearray(outer), timetag_offset
+
+def make_sender(sock):
+    """Return a send(payload) callable for a non-blocking socket.
+
+    The fast path is a bare send(); when the socket buffer is full
+    (rare with the enlarged SO_SNDBUF) wait for writability and retry,
+    so the timing loop never blocks inside the kernel copy.
+    """
+    raw_send = sock.send
+
+    def send(payload):
+        try:
+            raw_send(payload)
+        except BlockingIOError:
+            select.select([], [sock], [])
+            raw_send(payload)
+
+    return send
+
+def send_batch(sock, payloads):
+    """Send pre-serialized datagrams on a connected socket, batching up
+    to SENDMMSG_BATCH per sendmmsg(2) syscall where available."""
+    if _libc is None:
+        send = make_sender(sock)
+        for payload in payloads:
+            send(payload)
+        return
+    fd = sock.fileno()
+    offset = 0
+    total = len(payloads)
+    while offset < total:
+        chunk = payloads[offset:offset + SENDMMSG_BATCH]
+        hdrs = (_mmsghdr * len(chunk))()
+        iovs = (_iovec * len(chunk))()
+        for i, payload in enumerate(chunk):
+            iovs[i].iov_base = ctypes.cast(ctypes.c_char_p(payload), ctypes.c_void_p)
+            iovs[i].iov_len = len(payload)
+            hdrs[i].msg_hdr.msg_iov = ctypes.pointer(iovs[i])
+            hdrs[i].msg_hdr.msg_iovlen = 1
+        ctypes.set_errno(0)
+        sent = _libc.sendmmsg(fd, hdrs, len(chunk), 0)
+        if sent <= 0:
+            if ctypes.get_errno() == errno.EAGAIN:
+                # Socket buffer full; wait for drain and retry the chunk
+                select.select([], [sock], [])
+                continue
+            # Kernel refused the batch; fall back to plain sends
+            send = make_sender(sock)
+            for payload in payloads[offset:]:
+                send(payload)
+            return
+        offset += sent
+
+# ----------------------------------------------------------------------------
+# io_uring batching (Linux, optional): amortize syscalls across many sends
+# ----------------------------------------------------------------------------
+
+URING_ENTRIES = 128  # submission queue depth
+
+def send_batch_uring(sock, payloads):
+    """Send pre-serialized datagrams through io_uring.
+
+    Queues up to URING_ENTRIES sends, submits them with a single
+    io_uring_enter(2), then reaps the whole completion batch before
+    refilling — one syscall pair per URING_ENTRIES datagrams versus one
+    syscall per SENDMMSG_BATCH with sendmmsg."""
+    fd = sock.fileno()
+    ring = liburing.Ring()
+    liburing.io_uring_queue_init(URING_ENTRIES, ring)
+    cqe = liburing.Cqe()
+    try:
+        offset = 0
+        total = len(payloads)
+        while offset < total:
+            chunk = payloads[offset:offset + URING_ENTRIES]
+            for payload in chunk:
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_send(sqe, fd, payload)
+            liburing.io_uring_submit_and_wait(ring, len(chunk))
+            liburing.io_uring_wait_cqe(ring, cqe)
+            ready = liburing.io_uring_cq_ready(ring)
+            failed = any(cqe[i].res < 0 for i in range(ready))
+            liburing.io_uring_cq_advance(ring, ready)
+            if failed:
+                # Kernel refused part of the batch; finish via sendmmsg
+                send_batch(sock, payloads[offset:])
+                return
+            offset += ready
+    finally:
+        liburing.io_uring_queue_exit(ring)
+
+def simulate_button_press(dest, addresses, press_duration, interval, count,
+                          log_every=1, use_io_uring=False, use_bundle=False):
+    """Simulate button presses on one or more plinths.
+
+    dest is the (host, port) tuple the socket connect()s to once.
+    addresses is a list of OSC address prefixes; with more than one the
+    per-tick sends go out as a single sendmmsg batch, so every plinth
+    fires on the same deadline instead of drifting per-target. All the
+    datagrams share dest: fan-out assumes a single OSC server routing
+    /plinth/<id> addresses for every listed plinth, not one host per
+    plinth.
+    log_every controls progress output: print every Nth press (0 =
+    silent). Progress lines are written as raw bytes with the offset
+    from the schedule base, keeping strftime/f-string formatting out of
+    the send loop.
+    """
+    # The addresses and payloads never change, so serialize all the
+    # datagrams once; the loop then only does send()s and sleeps. The
+    # connect()-ed socket caches the destination in the kernel so each
+    # send skips per-call address handling.
+    press_list = [build_message(f"{a}/button/press", 1) for a in addresses]
+    release_list = [build_message(f"{a}/button/release", 0) for a in addresses]
+    press_bytes = press_list[0]
+    release_bytes = release_list[0]
+    fanout = len(addresses) > 1
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.connect(dest)
+    # Non-blocking with a large send buffer: bursts are absorbed by the
+    # kernel buffer and the scheduler never stalls inside send()
+    sock.setblocking(False)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+    # Fast-fail with EMSGSIZE if a payload ever outgrows the path MTU
+    # instead of silently fragmenting (Linux only)
+    if hasattr(socket, 'IP_MTU_DISCOVER'):
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MTU_DISCOVER,
+                        socket.IP_PMTUDISC_DO)
+
+    try:
+        # Stress mode: no timing constraints, so the whole run is just
+        # syscall throughput — batch press/release pairs via sendmmsg
+        if press_duration == 0 and interval == 0:
+            if use_io_uring and liburing is not None:
+                send_batch_uring(sock, (press_list + release_list) * count)
+            elif _fastsend is not None and not fanout:
+                _fastsend.run(sock.fileno(), press_bytes, release_bytes,
+                              count, 0, 0)
+            else:
+                if use_io_uring:
+                    print("[WARN] liburing not available; using sendmmsg batching")
+                send_batch(sock, (press_list + release_list) * count)
+            print(f"\nCompleted {count} button presses (batched)")
+            return
+
+        # Precompute the whole timeline from one monotonic base: press i
+        # fires at base + i*interval, its release press_duration later.
+        # With NumPy the arithmetic happens in two vectorized ops; the
+        # loop body is reduced to array loads and sends. Deadlines
+        # already in the past return from sleep_until immediately, so a
+        # loop that falls behind catches up on its own.
+        base_ns = time.monotonic_ns()
+        press_ns = int(press_duration * 1e9)
+        interval_ns = int(interval * 1e9)
+        gap_ns = interval_ns - press_ns  # release -> next press
+
+        # Native loop: with the extension built, no progress output
+        # requested and plain two-packet semantics, the whole run
+        # happens in C with the GIL released
+        if (_fastsend is not None and not use_bundle and not log_every
+                and not fanout):
+            _fastsend.run(sock.fileno(), press_bytes, release_bytes,
+                          count, press_ns, interval_ns)
+            print(f"\nCompleted {count} button presses (native)")
+            return
+
+        if np is not None:
+            release_deadlines = (base_ns + press_ns
+                                 + np.arange(count, dtype=np.int64) * interval_ns)
+            next_press_deadlines = release_deadlines + gap_ns
+        elif count > 10000 and interval_ns > 0:
+            # Large stress runs without NumPy: range objects index in
+            # O(1) without materializing two count-length lists
+            first = base_ns + press_ns
+            release_deadlines = range(first, first + count * interval_ns,
+                                      interval_ns)
+            next_press_deadlines = range(first + gap_ns,
+                                         first + gap_ns + count * interval_ns,
+                                         interval_ns)
+        else:
+            release_deadlines = [base_ns + press_ns + i * interval_ns
+                                 for i in range(count)]
+            next_press_deadlines = [d + gap_ns for d in release_deadlines]
+        write = sys.stdout.buffer.write
+        # Local bindings and memoryviews: send() resolves to LOAD_FAST
+        # and the kernel copy starts from the exported buffer without
+        # re-wrapping the bytes object each call
+        send = make_sender(sock)
+        wait = sleep_until
+        monotonic_ns = time.monotonic_ns
+        mv_press = memoryview(press_bytes)
+        mv_release = memoryview(release_bytes)
+
+        # Bundle mode: one datagram per tick carrying press + a release
+        # scheduled press_duration later via OSC timetag — half the
+        # packets, but the receiver must honor bundle timetags
+        if use_bundle:
+            templates = [build_bundle_template(a) for a in addresses]
+            bundles = [b for b, _ in templates]
+            for i in range(count):
+                if log_every and i % log_every == 0:
+                    write(b"[%d/%d] +%dms\n"
+                          % (i + 1, count,
+                             (time.monotonic_ns() - base_ns) // 1_000_000))
+                stamp = write_date(time.time() + press_duration)
+                for bundle, tt_off in templates:
+                    bundle[tt_off:tt_off + 8] = stamp
+                if fanout:
+                    # sendmmsg pins bytes objects; copy out of the
+                    # mutable templates once per tick
+                    send_batch(sock, [bytes(b) for b in bundles])
+                else:
+                    send(bundles[0])
+                if i != count - 1:
+                    sleep_until(int(next_press_deadlines[i]))
+            print(f"\nCompleted {count} button presses (bundled)")
+            return
+
+        # Fan-out: one sendmmsg batch per press and one per release
+        # covers every plinth on the same deadline
+        if fanout:
+            for i in range(count):
+                if log_every and i % log_every == 0:
+                    write(b"[%d/%d] +%dms\n"
+                          % (i + 1, count,
+                             (time.monotonic_ns() - base_ns) // 1_000_000))
+                send_batch(sock, press_list)
+                sleep_until(int(release_deadlines[i]))
+                send_batch(sock, release_list)
+                if i != count - 1:
+                    sleep_until(int(next_press_deadlines[i]))
+            print(f"\nCompleted {count} button presses "
+                  f"({len(addresses)} plinths)")
+            return
+
+        # Peel the final iteration: the loop body stays branch-free and
+        # the last press/release simply omits the trailing sleep
+        last = count - 1
+        for i in range(last):
+            if log_every and i % log_every == 0:
+                # Raw bytes %-formatting; offset from schedule base
+                # instead of a localtime()+strftime call per iteration
+                write(b"[%d/%d] +%dms\n"
+                      % (i + 1, count, (monotonic_ns() - base_ns) // 1_000_000))
+
+            # Send button press
+            send(mv_press)
+            wait(int(release_deadlines[i]))
+
+            # Send button release
+            send(mv_release)
+            wait(int(next_press_deadlines[i]))
+
+        if count > 0:
+            if log_every and last % log_every == 0:
+                write(b"[%d/%d] +%dms\n"
+                      % (count, count, (monotonic_ns() - base_ns) // 1_000_000))
+            send(mv_press)
+            wait(int(release_deadlines[last]))
+            send(mv_release)
+
+        print(f"\nCompleted {count} button presses")
+    finally:
+        sock.close()
+
+# Option schema: value options map name -> (cast, default); flag
+# options are booleans defaulting to False
+_VALUE_OPTS = {
+    'press_duration': (float, 0.2),
+    'interval': (float, 3.0),
+    'count': (int, 5),
+    'plinth_id': (int, 1),
+    'plinth_ids': (str, None),
+    'log_every': (int, 1),
+    'cpu': (int, None),
+    'spin_threshold_us': (int, 200),
+    'warmup': (float, None),
+}
+_FLAG_OPTS = ('io_uring', 'rt', 'bundle')
+
+def _build_arg_parser():
+    # Deferred: argparse costs ~15ms of cold-start import, so it is
+    # only loaded for --help output
+    import argparse
     parser = argparse.ArgumentParser(description="Simulate button presses on plinth")
     parser.add_argument('host', help='Plinth IP address')
     parser.add_argument('port', type=int, help='Plinth OSC RX port')
@@ -44,25 +472,124 @@ def main():
                        help='Number of presses to simulate (default: 5)')
     parser.add_argument('--plinth-id', type=int, default=1,
                        help='Plinth ID (default: 1)')
-    
-    args = parser.parse_args()
-    
+    parser.add_argument('--plinth-ids', default=None,
+                       help='Comma-separated plinth IDs; each tick fans out to all '
+                            'of them in one sendmmsg batch (overrides --plinth-id). '
+                            'All datagrams go to the single host:port, so the target '
+                            'must be a shared OSC server that routes /plinth/<id> '
+                            'addresses for every listed ID — with one Pi per plinth, '
+                            'run one instance per host instead')
+    parser.add_argument('--log-every', type=int, default=1,
+                       help='Print progress every N presses; 0 = silent (default: 1)')
+    parser.add_argument('--io-uring', action='store_true',
+                       help='Batch stress-mode sends through io_uring (needs liburing)')
+    parser.add_argument('--cpu', type=int, default=None,
+                       help='Pin the process to this CPU to avoid migration jitter')
+    parser.add_argument('--rt', action='store_true',
+                       help='Run with SCHED_FIFO priority and a locked heap (needs root)')
+    parser.add_argument('--spin-threshold-us', type=int, default=200,
+                       help='Busy-wait instead of sleeping below this many µs (default: 200)')
+    parser.add_argument('--bundle', action='store_true',
+                       help='Send press+release as one time-tagged OSC bundle per tick '
+                            '(receiver must honor bundle timetags)')
+    parser.add_argument('--warmup', type=float, default=None,
+                       help='Pause this many seconds after the banner before sending '
+                            '(default: 1 on a TTY, 0 otherwise)')
+    return parser
+
+def parse_args(argv):
+    """Parse argv against the fixed option schema.
+
+    The schema never changes, so a hand-rolled walk over sys.argv
+    replaces the general-purpose argparse machinery on the fast path;
+    --help still routes through argparse for the full usage text.
+    """
+    if '-h' in argv or '--help' in argv:
+        return _build_arg_parser().parse_args(argv)
+
+    opts = {name: default for name, (_, default) in _VALUE_OPTS.items()}
+    for name in _FLAG_OPTS:
+        opts[name] = False
+    positional = []
+    i = 0
+    n = len(argv)
+    while i < n:
+        arg = argv[i]
+        if arg.startswith('--'):
+            # Accept both --opt value and --opt=value, like argparse
+            name, sep, value = arg[2:].partition('=')
+            name = name.replace('-', '_')
+            if name in _FLAG_OPTS:
+                if sep:
+                    print(f"[ERROR] --{name.replace('_', '-')} takes no value")
+                    sys.exit(2)
+                opts[name] = True
+            elif name in _VALUE_OPTS:
+                if not sep:
+                    i += 1
+                    if i == n:
+                        print(f"[ERROR] {arg} requires a value")
+                        sys.exit(2)
+                    value = argv[i]
+                cast = _VALUE_OPTS[name][0]
+                try:
+                    opts[name] = cast(value)
+                except ValueError:
+                    print(f"[ERROR] invalid value for {arg}: {value}")
+                    sys.exit(2)
+            else:
+                print(f"[ERROR] unknown option {arg}")
+                sys.exit(2)
+        else:
+            positional.append(arg)
+        i += 1
+    if len(positional) != 2:
+        print(__doc__)
+        sys.exit(1)
+    opts['host'] = positional[0]
+    try:
+        opts['port'] = int(positional[1])
+    except ValueError:
+        print(f"[ERROR] invalid port: {positional[1]}")
+        sys.exit(2)
+    return types.SimpleNamespace(**opts)
+
+def main():
+    global SPIN_THRESHOLD_NS
+    args = parse_args(sys.argv[1:])
+
+
     if args.press_duration > args.interval:
         print("[ERROR] press-duration cannot be greater than interval")
         sys.exit(1)
     
+    if args.plinth_ids:
+        plinth_ids = [int(p) for p in args.plinth_ids.split(',')]
+    else:
+        plinth_ids = [args.plinth_id]
+
     try:
-        client = udp_client.SimpleUDPClient(args.host, args.port)
         print(f"Connected to {args.host}:{args.port}")
-        print(f"Plinth ID: {args.plinth_id}")
+        print(f"Plinth ID(s): {', '.join(str(p) for p in plinth_ids)}")
         print(f"Press duration: {args.press_duration}s")
         print(f"Interval: {args.interval}s")
         print(f"Count: {args.count}")
         print("-" * 40)
-        time.sleep(1)
-        
-        address = f"/plinth/{args.plinth_id}"
-        simulate_button_press(client, address, args.press_duration, args.interval, args.count)
+        # Only interactive runs need the banner pause; scripted
+        # invocations would otherwise pay a 1s wall-clock floor each
+        warmup = args.warmup
+        if warmup is None:
+            warmup = 1.0 if sys.stdout.isatty() else 0.0
+        if warmup > 0:
+            time.sleep(warmup)
+
+        SPIN_THRESHOLD_NS = args.spin_threshold_us * 1_000
+        pin_and_elevate(args.cpu, args.rt)
+        addresses = [f"/plinth/{p}" for p in plinth_ids]
+        simulate_button_press((args.host, args.port), addresses,
+                              args.press_duration, args.interval,
+                              args.count, args.log_every, args.io_uring,
+                              args.bundle)
     
     except Exception as e:
         print(f"[ERROR] {e}", file=sys.stderr)